@@ -1,3 +1,18 @@
+def calculate(num1, num2, operation):
+    """Apply operation (+, -, *, /) to two numbers"""
+    if operation == '+':
+        return num1 + num2
+    elif operation == '-':
+        return num1 - num2
+    elif operation == '*':
+        return num1 * num2
+    elif operation == '/':
+        if num2 == 0:
+            raise ZeroDivisionError("Division by zero")
+        return num1 / num2
+    else:
+        raise ValueError(f"Invalid operation: {operation}")
+
 def calculator():
     print("Simple Calculator")
     print("Operations: +, -, *, /")
@@ -6,25 +21,21 @@ def calculator():
         num1 = float(input("Enter first number: "))
         num2 = float(input("Enter second number: "))
         operation = input("Enter operation (+, -, *, /): ")
-
-        if operation == '+':
-            result = num1 + num2
-        elif operation == '-':
-            result = num1 - num2
-        elif operation == '*':
-            result = num1 * num2
-        elif operation == '/':
-            if num2 == 0:
-                print("Error: Division by zero")
-                return
-            result = num1 / num2
-        else:
-            print("Invalid operation")
-            return
-
-        print(f"Result: {result}")
     except ValueError:
         print("Invalid input. Please enter numbers.")
+        return
+
+    if operation not in ('+', '-', '*', '/'):
+        print("Invalid operation")
+        return
+
+    try:
+        result = calculate(num1, num2, operation)
+    except ZeroDivisionError:
+        print("Error: Division by zero")
+        return
+
+    print(f"Result: {result}")
 
 if __name__ == "__main__":
     calculator()
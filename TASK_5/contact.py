@@ -0,0 +1,113 @@
+import time
+from datetime import datetime
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def format_timestamp(value):
+    """Format an epoch timestamp for display and the text formats"""
+    return time.strftime(TIME_FORMAT, time.localtime(value))
+
+
+def parse_timestamp(value):
+    """Epoch seconds for a stored timestamp, or None if it cannot be read.
+
+    Integers pass through; strings in TIME_FORMAT, as written to JSON,
+    CSV and vCard files, are read as local time.
+    """
+    if isinstance(value, int):
+        return value
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return None
+
+
+class Contact:
+    # No per-instance __dict__: large books are mostly Contact objects.
+    # Timestamps are always kept as epoch seconds and only formatted for
+    # display and for the text formats (to_dict); to_row keeps them as
+    # integers for SQLite.
+    __slots__ = ('name', 'phone', 'email', 'address', 'id', '_created_at', '_updated_at')
+
+    def __init__(self, name, phone, email="", address=""):
+        self.name = name
+        self.phone = phone
+        self.email = email
+        self.address = address
+        self._created_at = self._updated_at = int(time.time())
+        self.id = None  # Set by storage backends that track rows
+    
+    @property
+    def created_at(self):
+        return format_timestamp(self._created_at)
+    
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = parse_timestamp(value)
+    
+    @property
+    def updated_at(self):
+        return format_timestamp(self._updated_at)
+    
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated_at = parse_timestamp(value)
+    
+    def touch(self):
+        """Mark the contact as updated now"""
+        self._updated_at = int(time.time())
+    
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'phone': self.phone,
+            'email': self.email,
+            'address': self.address,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
+    
+    def to_row(self):
+        """Field values in storage column order, with epoch timestamps"""
+        return (self.name, self.phone, self.email, self.address,
+                self._created_at, self._updated_at)
+    
+    @staticmethod
+    def from_dict(data):
+        # Bypass __init__ so no clock read is wasted on stored contacts
+        contact = Contact.__new__(Contact)
+        contact.name = data['name']
+        contact.phone = data['phone']
+        contact.email = data.get('email', '')
+        contact.address = data.get('address', '')
+        contact.id = None
+        # Unreadable timestamps are replaced rather than kept as text
+        created = data.get('created_at')
+        created_at = parse_timestamp(created)
+        if created_at is None:
+            created_at = int(time.time())
+        updated = data.get('updated_at', created)
+        # Most contacts were never edited, so skip parsing the same string twice
+        updated_at = created_at if updated == created else parse_timestamp(updated)
+        contact._created_at = created_at
+        contact._updated_at = created_at if updated_at is None else updated_at
+        return contact
+    
+    def display_summary(self, index=None):
+        """Display contact in list format"""
+        prefix = f"{index}. " if index is not None else ""
+        print(f"{prefix}{self.name:<30} | 📱 {self.phone:<15}")
+    
+    def display_details(self):
+        """Display full contact details"""
+        print("\n" + "="*60)
+        print(f"👤 CONTACT DETAILS")
+        print("="*60)
+        print(f"Name:    {self.name}")
+        print(f"Phone:   {self.phone}")
+        print(f"Email:   {self.email if self.email else 'Not provided'}")
+        print(f"Address: {self.address if self.address else 'Not provided'}")
+        print(f"Created: {self.created_at}")
+        print(f"Updated: {self.updated_at}")
+        print("="*60)
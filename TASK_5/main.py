@@ -1,55 +1,15 @@
-import json
+import csv
 import os
-from datetime import datetime
 
-class Contact:
-    def __init__(self, name, phone, email="", address=""):
-        self.name = name
-        self.phone = phone
-        self.email = email
-        self.address = address
-        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.updated_at = self.created_at
-    
-    def to_dict(self):
-        return {
-            'name': self.name,
-            'phone': self.phone,
-            'email': self.email,
-            'address': self.address,
-            'created_at': self.created_at,
-            'updated_at': self.updated_at
-        }
-    
-    @staticmethod
-    def from_dict(data):
-        contact = Contact(
-            data['name'],
-            data['phone'],
-            data.get('email', ''),
-            data.get('address', '')
-        )
-        contact.created_at = data.get('created_at', contact.created_at)
-        contact.updated_at = data.get('updated_at', contact.updated_at)
-        return contact
-    
-    def display_summary(self, index=None):
-        """Display contact in list format"""
-        prefix = f"{index}. " if index is not None else ""
-        print(f"{prefix}{self.name:<30} | 📱 {self.phone:<15}")
-    
-    def display_details(self):
-        """Display full contact details"""
-        print("\n" + "="*60)
-        print(f"👤 CONTACT DETAILS")
-        print("="*60)
-        print(f"Name:    {self.name}")
-        print(f"Phone:   {self.phone}")
-        print(f"Email:   {self.email if self.email else 'Not provided'}")
-        print(f"Address: {self.address if self.address else 'Not provided'}")
-        print(f"Created: {self.created_at}")
-        print(f"Updated: {self.updated_at}")
-        print("="*60)
+from contact import Contact
+from storage import open_storage
+from transfer import import_contacts, export_contacts
+from validation import validate_phone, validate_email
+
+PAGE_SIZE = 20
+SEARCH_OPTIONS = {'1': 'name', '2': 'phone', '3': 'email'}
+EXPORT_FORMATS = {'2': ('csv', 'contacts.csv'), '3': ('vcard', 'contacts.vcf'),
+                  '4': ('json', 'contacts-export.json')}
 
 def clear_screen():
     """Clear the console screen"""
@@ -61,42 +21,7 @@ def display_header(title):
     print(f"{title}")
     print("="*60)
 
-def load_contacts():
-    """Load contacts from JSON file with error handling"""
-    if not os.path.exists('contacts.json'):
-        return []
-    
-    try:
-        with open('contacts.json', 'r') as f:
-            data = json.load(f)
-            return [Contact.from_dict(item) for item in data]
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"⚠️ Warning: Could not load contacts. Starting fresh. Error: {e}")
-        return []
-
-def save_contacts(contacts):
-    """Save contacts to JSON file with error handling"""
-    try:
-        with open('contacts.json', 'w') as f:
-            json.dump([contact.to_dict() for contact in contacts], f, indent=4)
-        return True
-    except IOError as e:
-        print(f"❌ Error: Could not save contacts. Error: {e}")
-        return False
-
-def validate_phone(phone):
-    """Basic phone number validation"""
-    # Remove common separators
-    clean_phone = ''.join(filter(str.isdigit, phone))
-    return len(clean_phone) >= 10
-
-def validate_email(email):
-    """Basic email validation"""
-    if not email:  # Email is optional
-        return True
-    return '@' in email and '.' in email
-
-def add_contact(contacts):
+def add_contact(storage):
     clear_screen()
     display_header("➕ ADD NEW CONTACT")
     
@@ -105,7 +30,7 @@ def add_contact(contacts):
         name = input("Enter name (required): ").strip()
         if name:
             # Check for duplicate names
-            if any(c.name.lower() == name.lower() for c in contacts):
+            if storage.name_exists(name):
                 print("⚠️ A contact with this name already exists!")
                 choice = input("Do you want to continue anyway? (yes/no): ").lower()
                 if choice not in ['yes', 'y']:
@@ -132,9 +57,8 @@ def add_contact(contacts):
     
     # Create and add contact
     new_contact = Contact(name, phone, email, address)
-    contacts.append(new_contact)
     
-    if save_contacts(contacts):
+    if storage.add(new_contact):
         print(f"\n✅ Contact '{name}' added successfully!")
         new_contact.display_details()
     else:
@@ -142,75 +66,99 @@ def add_contact(contacts):
     
     input("\nPress Enter to continue...")
 
-def display_contact_list(contacts):
-    """Display contact list without asking for details"""
-    if not contacts:
-        print("No contacts found.")
-        return []
-    
-    # Sort contacts alphabetically
-    sorted_contacts = sorted(contacts, key=lambda x: x.name.lower())
-    
-    print(f"Total contacts: {len(contacts)}\n")
+def display_contact_list(page, offset, total):
+    """Display one page of the contact list without asking for details"""
+    print(f"Total contacts: {total}\n")
     print("INDEX | NAME                          | PHONE")
     print("-" * 60)
     
-    for i, contact in enumerate(sorted_contacts, 1):
+    # Numbers run across pages, so they stay valid while paging
+    for i, contact in enumerate(page, offset + 1):
         print(f"{i:5} | {contact.name:<30} | {contact.phone}")
     
-    return sorted_contacts
+    if total > PAGE_SIZE:
+        print(f"\nPage {offset // PAGE_SIZE + 1} of {(total - 1) // PAGE_SIZE + 1}"
+              " (n = next page, p = previous page)")
 
-def view_contacts(contacts):
+def select_contact(storage, title, intro, prompt):
+    """Page through the contact list until the user picks a number.
+    
+    Only the page on screen is loaded from storage. Returns the chosen
+    contact, None if the user entered 0, or the raw input if it was not
+    a number on the current page.
+    """
+    total = storage.count()
+    offset = 0
+    while True:
+        clear_screen()
+        display_header(title)
+        if intro:
+            print(intro)
+        page = storage.load(PAGE_SIZE, offset)
+        display_contact_list(page, offset, total)
+        
+        choice = input(prompt).strip().lower()
+        if choice == 'n' and offset + PAGE_SIZE < total:
+            offset += PAGE_SIZE
+        elif choice == 'p' and offset > 0:
+            offset -= PAGE_SIZE
+        elif choice == '0':
+            return None
+        elif choice.isdigit() and offset < int(choice) <= offset + len(page):
+            return page[int(choice) - offset - 1]
+        else:
+            return choice
+
+def view_contacts(storage):
     clear_screen()
     display_header("📖 CONTACT LIST")
     
-    if not contacts:
+    if not storage.count():
         print("No contacts found. Add some contacts first!")
         input("\nPress Enter to continue...")
         return
     
-    sorted_contacts = display_contact_list(contacts)
+    contact = select_contact(storage, "📖 CONTACT LIST", "",
+                             "\nEnter contact number to view details (or 0 to go back): ")
     
-    print("\n" + "-" * 60)
-    choice = input("Enter contact number to view details (or 0 to go back): ").strip()
-    
-    if choice.isdigit():
-        index = int(choice)
-        if index == 0:
-            return
-        if 1 <= index <= len(sorted_contacts):
-            clear_screen()
-            sorted_contacts[index - 1].display_details()
-            input("\nPress Enter to continue...")
+    if isinstance(contact, Contact):
+        clear_screen()
+        contact.display_details()
+        input("\nPress Enter to continue...")
 
-def search_contact(contacts):
+def search_contact(storage):
     clear_screen()
     display_header("🔍 SEARCH CONTACTS")
     
-    if not contacts:
+    if not storage.count():
         print("No contacts available to search.")
         input("\nPress Enter to continue...")
         return
     
+    # Fuzzy search needs an index of the whole book; build it while the user types
+    storage.start_fuzzy_index()
+    
     print("Search by:")
     print("1. Name")
     print("2. Phone")
     print("3. Email")
-    print("4. Back to Main Menu")
+    print("4. Fuzzy (name, email, address)")
+    print("5. Back to Main Menu")
     
-    search_type = input("\nChoose option (1-4): ").strip()
+    search_type = input("\nChoose option (1-5): ").strip()
     
-    if search_type == '4':
+    if search_type == '5':
         return
     
     query = input("\nEnter search term: ").strip().lower()
     
-    if search_type == '1':
-        results = [c for c in contacts if query in c.name.lower()]
-    elif search_type == '2':
-        results = [c for c in contacts if query in c.phone]
-    elif search_type == '3':
-        results = [c for c in contacts if query in c.email.lower()]
+    if search_type in ('1', '2', '3'):
+        results = storage.search(SEARCH_OPTIONS[search_type], query)
+    elif search_type == '4':
+        # Ranked, typo-tolerant matches ("jon smtih" finds "John Smith")
+        if not storage.fuzzy_index_ready():
+            print(f"⏳ Indexing {storage.count()} contacts for fuzzy search. Large books take a while...")
+        results = storage.fuzzy_search(query)
     else:
         print("❌ Invalid option.")
         input("\nPress Enter to continue...")
@@ -238,181 +186,202 @@ def search_contact(contacts):
     
     input("\nPress Enter to continue...")
 
-def update_contact(contacts):
+def update_contact(storage):
     clear_screen()
     display_header("✏️ UPDATE CONTACT")
     
-    if not contacts:
+    if not storage.count():
         print("No contacts available to update.")
         input("\nPress Enter to continue...")
         return
     
     # Display contacts and get selection
-    print("Select a contact to update:\n")
-    sorted_contacts = display_contact_list(contacts)
+    contact = select_contact(storage, "✏️ UPDATE CONTACT", "Select a contact to update:\n",
+                             "\nEnter contact number to update (or 0 to cancel): ")
     
-    try:
-        choice = input("\nEnter contact number to update (or 0 to cancel): ").strip()
-        
-        if not choice.isdigit():
+    if contact is None:  # User entered 0
+        return
+    
+    if not isinstance(contact, Contact):
+        if contact.isdigit():
+            print("❌ Invalid contact number.")
+        else:
             print("❌ Please enter a valid number.")
-            input("\nPress Enter to continue...")
-            return
-            
-        index = int(choice)
-        
-        if index == 0:  # User entered 0
-            return
-            
-        if 1 <= index <= len(sorted_contacts):
-            contact = sorted_contacts[index - 1]
-            original_contacts_index = contacts.index(contact)
-            
-            clear_screen()
-            display_header(f"✏️ UPDATE CONTACT: {contact.name}")
+        input("\nPress Enter to continue...")
+        return
+    
+    clear_screen()
+    display_header(f"✏️ UPDATE CONTACT: {contact.name}")
+    contact.display_details()
+    
+    print("\nLeave field empty to keep current value.")
+    print("-" * 40)
+    
+    # Get updated values
+    new_name = input(f"\nNew name [{contact.name}]: ").strip()
+    new_phone = input(f"New phone [{contact.phone}]: ").strip()
+    new_email = input(f"New email [{contact.email}]: ").strip()
+    new_address = input(f"New address [{contact.address}]: ").strip()
+    
+    # Validate phone if changed
+    if new_phone and not validate_phone(new_phone):
+        print("❌ Invalid phone number. Update cancelled.")
+        input("\nPress Enter to continue...")
+        return
+    
+    # Validate email if changed
+    if new_email and not validate_email(new_email):
+        print("❌ Invalid email format. Update cancelled.")
+        input("\nPress Enter to continue...")
+        return
+    
+    # Update only changed fields
+    updates_made = False
+    if new_name and new_name != contact.name:
+        contact.name = new_name
+        updates_made = True
+    
+    if new_phone and new_phone != contact.phone:
+        contact.phone = new_phone
+        updates_made = True
+    
+    if new_email != contact.email:
+        contact.email = new_email
+        updates_made = True
+    
+    if new_address != contact.address:
+        contact.address = new_address
+        updates_made = True
+    
+    if updates_made:
+        contact.touch()
+        if storage.update(contact):
+            print(f"\n✅ Contact updated successfully!")
             contact.display_details()
-            
-            print("\nLeave field empty to keep current value.")
-            print("-" * 40)
-            
-            # Get updated values
-            new_name = input(f"\nNew name [{contact.name}]: ").strip()
-            new_phone = input(f"New phone [{contact.phone}]: ").strip()
-            new_email = input(f"New email [{contact.email}]: ").strip()
-            new_address = input(f"New address [{contact.address}]: ").strip()
-            
-            # Validate phone if changed
-            if new_phone and not validate_phone(new_phone):
-                print("❌ Invalid phone number. Update cancelled.")
-                input("\nPress Enter to continue...")
-                return
-            
-            # Validate email if changed
-            if new_email and not validate_email(new_email):
-                print("❌ Invalid email format. Update cancelled.")
-                input("\nPress Enter to continue...")
-                return
-            
-            # Update only changed fields
-            updates_made = False
-            if new_name and new_name != contact.name:
-                contact.name = new_name
-                updates_made = True
-            
-            if new_phone and new_phone != contact.phone:
-                contact.phone = new_phone
-                updates_made = True
-            
-            if new_email != contact.email:
-                contact.email = new_email
-                updates_made = True
-            
-            if new_address != contact.address:
-                contact.address = new_address
-                updates_made = True
-            
-            if updates_made:
-                contact.updated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                # Update the contact in the original list
-                contacts[original_contacts_index] = contact
-                if save_contacts(contacts):
-                    print(f"\n✅ Contact updated successfully!")
-                    contact.display_details()
-                else:
-                    print("❌ Failed to save changes.")
-            else:
-                print("\nℹ️ No changes made.")
         else:
-            print("❌ Invalid contact number.")
-    
-    except ValueError:
-        print("❌ Invalid input. Please enter a number.")
+            print("❌ Failed to save changes.")
+    else:
+        print("\nℹ️ No changes made.")
     
     input("\nPress Enter to continue...")
 
-def delete_contact(contacts):
+def delete_contact(storage):
     clear_screen()
     display_header("🗑️ DELETE CONTACT")
     
-    if not contacts:
+    if not storage.count():
         print("No contacts available to delete.")
         input("\nPress Enter to continue...")
         return
     
     # Display contacts and get selection
-    print("Select a contact to delete:\n")
-    sorted_contacts = display_contact_list(contacts)
+    contact = select_contact(storage, "🗑️ DELETE CONTACT", "Select a contact to delete:\n",
+                             "\nEnter contact number to delete (or 0 to cancel): ")
     
-    try:
-        choice = input("\nEnter contact number to delete (or 0 to cancel): ").strip()
-        
-        if not choice.isdigit():
-            print("❌ Please enter a valid number.")
-            input("\nPress Enter to continue...")
-            return
-            
-        index = int(choice)
-        
-        if index == 0:  # User entered 0
-            return
-            
-        if 1 <= index <= len(sorted_contacts):
-            contact = sorted_contacts[index - 1]
-            original_contacts_index = contacts.index(contact)
-            
-            clear_screen()
-            display_header(f"🗑️ DELETE CONTACT")
-            contact.display_details()
-            
-            confirm = input(f"\n⚠️ Are you SURE you want to delete '{contact.name}'? (yes/no): ").strip().lower()
-            
-            if confirm in ['yes', 'y']:
-                deleted_contact = contacts.pop(original_contacts_index)
-                if save_contacts(contacts):
-                    print(f"\n✅ Contact '{deleted_contact.name}' deleted successfully!")
-                else:
-                    print("❌ Failed to save changes. Contact not deleted.")
-                    contacts.insert(original_contacts_index, deleted_contact)  # Restore contact
-            else:
-                print("❌ Deletion cancelled.")
-        else:
+    if contact is None:  # User entered 0
+        return
+    
+    if not isinstance(contact, Contact):
+        if contact.isdigit():
             print("❌ Invalid contact number.")
+        else:
+            print("❌ Please enter a valid number.")
+        input("\nPress Enter to continue...")
+        return
+    
+    clear_screen()
+    display_header(f"🗑️ DELETE CONTACT")
+    contact.display_details()
+    
+    confirm = input(f"\n⚠️ Are you SURE you want to delete '{contact.name}'? (yes/no): ").strip().lower()
     
-    except ValueError:
-        print("❌ Invalid input. Please enter a number.")
+    if confirm in ['yes', 'y']:
+        if storage.delete(contact):
+            print(f"\n✅ Contact '{contact.name}' deleted successfully!")
+        else:
+            print("❌ Failed to save changes. Contact not deleted.")
+    else:
+        print("❌ Deletion cancelled.")
     
     input("\nPress Enter to continue...")
 
-def display_statistics(contacts):
+def display_statistics(storage):
     clear_screen()
     display_header("📊 CONTACT BOOK STATISTICS")
     
-    total = len(contacts)
+    stats = storage.statistics()
+    total = stats['total']
     print(f"Total contacts: {total}")
     
     if total > 0:
-        with_email = sum(1 for c in contacts if c.email)
-        with_address = sum(1 for c in contacts if c.address)
+        with_email = stats['with_email']
+        with_address = stats['with_address']
         
         print(f"Contacts with email: {with_email} ({with_email/total*100:.1f}%)")
         print(f"Contacts with address: {with_address} ({with_address/total*100:.1f}%)")
         
         # Find most recent updates
-        recent_contacts = sorted(contacts, key=lambda x: x.updated_at, reverse=True)[:3]
         print("\n🕒 Recently updated contacts:")
-        for contact in recent_contacts:
+        for contact in stats['recent']:
             print(f"  • {contact.name} (updated: {contact.updated_at})")
     
     input("\nPress Enter to continue...")
 
+def import_export(storage):
+    clear_screen()
+    display_header("📦 IMPORT / EXPORT")
+    
+    print("1. Import from CSV, vCard or JSON (.csv, .vcf, .json)")
+    print("2. Export to CSV")
+    print("3. Export to vCard")
+    print("4. Export to JSON (contacts.json format)")
+    print("5. Back to Main Menu")
+    
+    option = input("\nChoose option (1-5): ").strip()
+    
+    if option == '5':
+        return
+    
+    if option == '1':
+        path = input("Enter file to import: ").strip()
+        try:
+            # Batches are written as they are read and committed together
+            with storage.bulk_add() as add_batch:
+                stats = import_contacts(storage.keys(), path, add_batch)
+        except (ValueError, IOError, csv.Error) as e:
+            print(f"❌ Import failed. Nothing was imported. Error: {e}")
+            input("\nPress Enter to continue...")
+            return
+        
+        print(f"\n✅ Imported {stats['added']} contacts.")
+        print(f"Skipped {stats['duplicates']} duplicates and {stats['invalid']} invalid records.")
+    elif option in EXPORT_FORMATS:
+        fmt, default = EXPORT_FORMATS[option]
+        path = input(f"Enter file to export to [{default}]: ").strip() or default
+        # Writing over the open book would truncate it mid-export
+        if os.path.abspath(path) == os.path.abspath(storage.filename):
+            print(f"❌ '{path}' is the contact book itself. Choose another file.")
+            input("\nPress Enter to continue...")
+            return
+        try:
+            count = export_contacts(storage.iter_contacts(), path, fmt)
+            print(f"\n✅ Exported {count} contacts to '{path}'.")
+        except IOError as e:
+            print(f"❌ Export failed. Error: {e}")
+    else:
+        print("❌ Invalid option.")
+    
+    input("\nPress Enter to continue...")
+
 def main():
     clear_screen()
     print("\n" + "🌟" * 30)
     print("       WELCOME TO CONTACT BOOK")
     print("🌟" * 30)
     
-    contacts = load_contacts()
-    print(f"📂 Loaded {len(contacts)} contacts from storage.\n")
+    # Views load what they show, so nothing is read up front
+    storage = open_storage()
+    print(f"📂 {storage.count()} contacts in storage.\n")
     input("Press Enter to continue...")
     
     while True:
@@ -426,33 +395,37 @@ def main():
         print("4. ✏️ Update Contact")
         print("5. 🗑️ Delete Contact")
         print("6. 📊 View Statistics")
-        print("7. 🚪 Exit")
+        print("7. 📦 Import / Export")
+        print("8. 🚪 Exit")
         print("=" * 60)
         
-        choice = input("\nChoose an option (1-7): ").strip()
+        choice = input("\nChoose an option (1-8): ").strip()
         
         if choice == '1':
-            add_contact(contacts)
+            add_contact(storage)
         elif choice == '2':
-            view_contacts(contacts)
+            view_contacts(storage)
         elif choice == '3':
-            search_contact(contacts)
+            search_contact(storage)
         elif choice == '4':
-            update_contact(contacts)
+            update_contact(storage)
         elif choice == '5':
-            delete_contact(contacts)
+            delete_contact(storage)
         elif choice == '6':
-            display_statistics(contacts)
+            display_statistics(storage)
         elif choice == '7':
+            import_export(storage)
+        elif choice == '8':
             clear_screen()
             print("\n" + "=" * 60)
             print("Thank you for using Contact Book!")
-            print("All data has been saved to 'contacts.json'")
+            print(f"All data has been saved to '{storage.filename}'")
             print("=" * 60)
             print("\n👋 Goodbye!\n")
+            storage.close()
             break
         else:
-            print("\n❌ Invalid choice. Please enter a number between 1-7.")
+            print("\n❌ Invalid choice. Please enter a number between 1-8.")
             input("Press Enter to continue...")
 
 if __name__ == "__main__":
@@ -0,0 +1,314 @@
+import heapq
+import math
+import re
+import string
+import sys
+from collections import defaultdict
+from itertools import islice
+
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+|\d+")
+SEARCH_FIELDS = ('name', 'email', 'address')
+MAX_COMBINATIONS = 4096  # Candidate combinations a multi-word query may try
+COMMON_SHARE = 0.2       # Tokens held by more contacts than this are "common"
+COMMON_WEIGHT = 0.75     # What a common token (email domain, "st") counts for
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def ngrams(token, n=3, closed=True):
+    """Return the character n-grams of a token padded with one space each side.
+
+    With closed=False the end is left open, giving the n-grams every
+    token that starts with this one contains.
+    """
+    padded = " " + token + " " if closed else " " + token
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def single_edits(token):
+    """Every string one deletion, swap, substitution or insertion from token"""
+    alphabet = string.digits if token.isdigit() else string.ascii_lowercase
+    splits = [(token[:i], token[i:]) for i in range(len(token) + 1)]
+    edits = set()
+    for left, right in splits:
+        if right:
+            edits.add(left + right[1:])
+            for char in alphabet:
+                edits.add(left + char + right[1:])
+        if len(right) > 1:
+            edits.add(left + right[1] + right[0] + right[2:])
+        for char in alphabet:
+            edits.add(left + char + right)
+    edits.discard(token)
+    return edits
+
+
+def edit_distance(a, b, max_distance=None):
+    """Optimal string alignment distance (Levenshtein plus adjacent swaps).
+
+    Stops early and returns max_distance + 1 once the distance is known
+    to exceed max_distance.
+    """
+    if a == b:
+        return 0
+    if max_distance is not None and abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = 0 if char_a == char_b else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and char_a == b[j - 2] and a[i - 2] == char_b):
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def similarity(a, b, min_similarity=0.0):
+    """Similarity between two tokens in the range 0..1.
+
+    Typos rarely hit the first letter, so a near match that keeps it gets
+    a small bonus ("jon" is closer to "john" than to "pjon").
+    """
+    longest = max(len(a), len(b))
+    if longest == 0:
+        return 1.0
+    max_distance = int(longest * (1 - min_similarity))
+    distance = edit_distance(a, b, max_distance)
+    if distance > max_distance:
+        return 0.0
+    score = 1 - distance / longest
+    if distance and a[0] == b[0]:
+        score = min(score + 0.05, 0.99)
+    return score
+
+
+def reachable_lengths(length, min_similarity):
+    """Token lengths that can still reach min_similarity against length"""
+    if min_similarity <= 0:
+        return range(1, length * 2 + 1)
+    return range(max(1, math.ceil(length * min_similarity)), int(length / min_similarity) + 1)
+
+
+class ContactIndex:
+    """Token and n-gram index over contacts for fuzzy lookups.
+
+    Contacts are mapped to their word tokens, and each distinct word is
+    indexed by its character trigrams and length. A query token only gets
+    compared (by edit distance) against vocabulary tokens of a reachable
+    length that share the most trigrams with it, so the cost of a search
+    depends on the size of the matching vocabulary rather than the number
+    of contacts. Numbers are not trigram-indexed; they match exactly or
+    with a single typo. Build it once and keep it current with
+    add/update/remove.
+
+    key maps a contact to its identity in the index (the object itself by
+    default); backends that hand out fresh objects per load pass the row id.
+    """
+
+    def __init__(self, contacts=(), fields=SEARCH_FIELDS, n=3, key=None):
+        self.fields = fields
+        self.n = n
+        self.key = key or (lambda contact: contact)
+        self.entries = {}                   # key -> (contact, tokens it was indexed under)
+        # token -> keys holding it; a 1-tuple until a second contact has the
+        # token, since most tokens (email numbers, rare surnames) are unique
+        self.postings = {}
+        self.gram_index = defaultdict(list)  # (trigram, token length) -> words
+        self.max_length = 0
+        for contact in contacts:
+            self.add(contact)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, contact):
+        """Index a single contact"""
+        text = " ".join(getattr(contact, field, "") or "" for field in self.fields)
+        # Interned so every contact shares one copy of "john" or "com"
+        tokens = tuple({sys.intern(token) for token in tokenize(text)})
+        key = self.key(contact)
+        self.entries[key] = (contact, tokens)
+        postings = self.postings
+        for token in tokens:
+            holders = postings.get(token)
+            if holders is None:
+                postings[token] = (key,)
+                if not token.isdigit():
+                    for gram in ngrams(token, self.n):
+                        self.gram_index[gram, len(token)].append(token)
+                    self.max_length = max(self.max_length, len(token))
+            elif type(holders) is tuple:
+                postings[token] = {holders[0], key}
+            else:
+                holders.add(key)
+
+    def remove(self, contact):
+        """Drop a contact from the index"""
+        key = self.key(contact)
+        _, tokens = self.entries.pop(key, (None, ()))
+        for token in tokens:
+            holders = self.postings[token]
+            if type(holders) is not tuple:
+                holders.discard(key)
+                if holders:
+                    continue
+            del self.postings[token]
+            if token.isdigit():
+                continue
+            for gram in ngrams(token, self.n):
+                grams = self.gram_index[gram, len(token)]
+                grams.remove(token)
+                if not grams:
+                    del self.gram_index[gram, len(token)]
+
+    def update(self, contact):
+        """Re-index a contact after its fields changed"""
+        self.remove(contact)
+        self.add(contact)
+
+    def completions(self, token, limit):
+        """Up to limit indexed words that start with token, shortest first"""
+        grams = ngrams(token, self.n, closed=False)
+        found = []
+        if not grams or token.isdigit():
+            return found
+        for length in range(len(token) + 1, self.max_length + 1):
+            sets = [self.gram_index.get((gram, length)) for gram in grams]
+            if not all(sets):
+                continue
+            sets.sort(key=len)
+            found.extend(word for word in set(sets[0]).intersection(*sets[1:])
+                         if word.startswith(token))
+            if len(found) >= limit:
+                break
+        return found[:limit]
+
+    def similar_tokens(self, token, min_similarity, max_candidates, prefix=False):
+        """Return {vocabulary token: similarity} for tokens close to token.
+
+        With prefix=True, words that start with token score just below an
+        exact match and above any typo ("smi" -> "smith").
+        """
+        if token in self.postings:
+            matches = {token: 1.0}
+        else:
+            matches = {}
+
+        length = len(token)
+        ranked = []
+        if not token.isdigit():
+            shared = defaultdict(int)
+            for gram in ngrams(token, self.n):
+                for candidate_length in reachable_lengths(length, min_similarity):
+                    for candidate in self.gram_index.get((gram, candidate_length), ()):
+                        shared[candidate] += 1
+
+            # Prefer more shared trigrams and, on ties, closer lengths so that
+            # "smith" outranks "smiths" for "smtih".
+            ranked = heapq.nlargest(
+                max_candidates, shared,
+                key=lambda candidate: (shared[candidate], -abs(len(candidate) - length)))
+
+        # Single typos are looked up directly; trigrams alone can miss them
+        # in short words ("smtih" and "smith" share a single trigram).
+        close = [edit for edit in single_edits(token) if edit in self.postings]
+
+        for candidate in close + ranked:
+            if candidate in matches:
+                continue
+            score = similarity(token, candidate, min_similarity)
+            if score >= min_similarity:
+                matches[candidate] = score
+
+        if prefix:
+            # Similarity tops out at 0.99, so completions rank above typos;
+            # among themselves, words more contacts hold come first
+            for candidate in self.completions(token, max_candidates):
+                holders = len(self.postings[candidate])
+                matches[candidate] = 0.99 + 0.01 * holders / (holders + 1)
+        return matches
+
+    def is_common(self, token):
+        """True for tokens most contacts share, such as email domains"""
+        return len(self.postings[token]) > COMMON_SHARE * len(self.entries)
+
+    def search(self, query, limit=10, min_similarity=0.6, max_candidates=200,
+               max_holders=20000):
+        """Return up to limit (score, contact) pairs, best match first.
+
+        Each query token gets a list of matching vocabulary tokens, and
+        combinations of one match (or none) per query token are tried best
+        total first. A contact is scored by the first combination it holds
+        every token of, which is its best, so the search stops as soon as
+        limit contacts are found; common tokens are never expanded into
+        their full posting sets. The last query token also matches as a
+        prefix, since it may still be being typed.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+        total = len(query_tokens)
+        width = max(1, int(MAX_COMBINATIONS ** (1 / total)))
+
+        options = []
+        for position, token in enumerate(query_tokens):
+            matches = self.similar_tokens(token, min_similarity, max_candidates,
+                                          prefix=position == total - 1)
+            # On equal scores, prefer the word more contacts hold ("john" over "jhn")
+            ranked = sorted(matches.items(),
+                            key=lambda item: (-item[1], -len(self.postings[item[0]])))[:width]
+            # A query word whose best match is common ("st", "com") counts
+            # less, so partial matches are decided by the rarer words
+            weight = COMMON_WEIGHT if total > 1 and ranked and self.is_common(ranked[0][0]) else 1.0
+            options.append([(score * weight, candidate) for candidate, score in ranked] + [(0.0, None)])
+
+        results = {}
+        for score, combination in best_combinations(options):
+            sets = sorted((self.postings[candidate] for candidate in combination
+                           if candidate is not None), key=len)
+            if not sets:
+                continue
+            # Walk the smallest posting set and probe the others
+            smallest, others = sets[0], sets[1:]
+            for key in islice(smallest, max_holders):
+                if key not in results and all(key in holders for holders in others):
+                    results[key] = score
+                    if len(results) >= limit:
+                        break
+            if len(results) >= limit:
+                break
+
+        return [(score / total, self.entries[key][0]) for key, score in results.items()]
+
+
+def best_combinations(options):
+    """Yield (total score, choices) taking one (score, choice) from each list.
+
+    Every list must be sorted best first. Combinations come out in order
+    of decreasing total and are generated lazily from a heap.
+    """
+    def total(position):
+        return sum(option[index][0] for option, index in zip(options, position))
+
+    start = (0,) * len(options)
+    heap = [(-total(start), start)]
+    seen = {start}
+    while heap:
+        negative, position = heapq.heappop(heap)
+        yield -negative, [option[index][1] for option, index in zip(options, position)]
+        for i, index in enumerate(position):
+            if index + 1 < len(options[i]):
+                following = position[:i] + (index + 1,) + position[i + 1:]
+                if following not in seen:
+                    seen.add(following)
+                    heapq.heappush(heap, (-total(following), following))
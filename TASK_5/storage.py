@@ -0,0 +1,506 @@
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+
+from contact import Contact, parse_timestamp
+from search import ContactIndex
+
+JSON_FILE = 'contacts.json'
+DB_FILE = 'contacts.db'
+SEARCH_FIELDS = ('name', 'phone', 'email')
+
+CONTACTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS contacts (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        phone TEXT NOT NULL,
+        email TEXT NOT NULL DEFAULT '',
+        address TEXT NOT NULL DEFAULT '',
+        created_at INTEGER NOT NULL,
+        updated_at INTEGER NOT NULL
+    )
+"""
+
+
+def load_contacts(filename=JSON_FILE):
+    """Load contacts from JSON file with error handling"""
+    if not os.path.exists(filename):
+        return []
+
+    try:
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        # Convert in place so each dict is freed as soon as it is replaced
+        for i, item in enumerate(data):
+            data[i] = Contact.from_dict(item)
+        return data
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"⚠️ Warning: Could not load contacts. Starting fresh. Error: {e}")
+        return []
+
+
+def save_contacts(contacts, filename=JSON_FILE):
+    """Save contacts to JSON file with error handling"""
+    try:
+        with open(filename, 'w') as f:
+            json.dump([contact.to_dict() for contact in contacts], f, indent=4)
+        return True
+    except IOError as e:
+        print(f"❌ Error: Could not save contacts. Error: {e}")
+        return False
+
+
+class Storage:
+    """Behaviour shared by the backends.
+
+    Views ask the backend for what they show (a page, search results,
+    statistics) instead of holding the whole book. The fuzzy search index
+    needs every contact, so it is built in a background thread the first
+    time it is asked for and then kept current by add/update/delete;
+    changes made while it is being built are replayed once it is done.
+    """
+
+    search_index = None
+    _indexer = None
+
+    def index_key(self, contact):
+        return contact
+
+    def start_fuzzy_index(self):
+        """Start building the fuzzy search index in the background (once)"""
+        if self._indexer is not None:
+            return
+        self._index_lock = threading.Lock()
+        self._pending = []
+        self._indexer = threading.Thread(
+            target=self._build_index, args=(self._index_source(),), daemon=True)
+        self._indexer.start()
+
+    def fuzzy_index_ready(self):
+        return self.search_index is not None
+
+    def fuzzy_search(self, query, limit=10):
+        """Ranked, typo-tolerant search over name, email and address"""
+        self.start_fuzzy_index()
+        self._indexer.join()
+        return [contact for score, contact in self.search_index.search(query, limit)]
+
+    def _index_source(self):
+        return self.load()
+
+    def _build_index(self, contacts):
+        index = ContactIndex(contacts, key=self.index_key)
+        with self._index_lock:
+            for change in self._pending:
+                self._apply(index, *change)
+            self._pending = None
+            self.search_index = index
+
+    def _reindex(self, added=(), updated=(), removed=()):
+        if self._indexer is None:
+            return
+        with self._index_lock:
+            if self.search_index is None:
+                self._pending.append((list(added), list(updated), list(removed)))
+            else:
+                self._apply(self.search_index, added, updated, removed)
+
+    @staticmethod
+    def _apply(index, added, updated, removed):
+        # Replaying a change the index already saw leaves it unchanged
+        for contact in removed:
+            index.remove(contact)
+        for contact in updated:
+            index.update(contact)
+        for contact in added:
+            index.add(contact)
+
+
+class JSONStorage(Storage):
+    """The original format: the whole book in one JSON file.
+
+    The file is read once on first use and rewritten on every change.
+    """
+
+    def __init__(self, filename=JSON_FILE):
+        self.filename = filename
+        self._contacts = None
+
+    @property
+    def contacts(self):
+        if self._contacts is None:
+            self._contacts = load_contacts(self.filename)
+        return self._contacts
+
+    def load(self, limit=None, offset=0):
+        """Return contacts sorted by name, optionally one page at a time"""
+        ordered = sorted(self.contacts, key=lambda x: x.name.lower())
+        if limit is None:
+            return ordered[offset:]
+        return ordered[offset:offset + limit]
+
+    def count(self):
+        return len(self.contacts)
+
+    def iter_contacts(self):
+        return iter(self.load())
+
+    def search(self, field, query):
+        """Contacts whose field contains query (case-insensitive)"""
+        query = query.lower()
+        return [c for c in self.contacts if query in getattr(c, field).lower()]
+
+    def name_exists(self, name):
+        name = name.lower()
+        return any(c.name.lower() == name for c in self.contacts)
+
+    def statistics(self, recent=3):
+        contacts = self.contacts
+        return {
+            'total': len(contacts),
+            'with_email': sum(1 for c in contacts if c.email),
+            'with_address': sum(1 for c in contacts if c.address),
+            # Compare the epoch seconds rather than formatting every timestamp
+            'recent': sorted(contacts, key=lambda x: x._updated_at, reverse=True)[:recent],
+        }
+
+    def add(self, contact):
+        self.contacts.append(contact)
+        if not save_contacts(self.contacts, self.filename):
+            self.contacts.remove(contact)
+            return False
+        self._reindex(added=[contact])
+        return True
+
+    def add_many(self, new_contacts):
+        original_count = len(self.contacts)
+        self.contacts.extend(new_contacts)
+        if not save_contacts(self.contacts, self.filename):
+            del self.contacts[original_count:]
+            return False
+        self._reindex(added=new_contacts)
+        return True
+
+    def keys(self):
+        """Yield the (name, phone) pair of every contact"""
+        for contact in self.contacts:
+            yield contact.name, contact.phone
+
+    @contextlib.contextmanager
+    def bulk_add(self):
+        """Add contacts batch by batch, saved once when the block ends.
+
+        Yields a function that takes a list of contacts. If the block
+        raises, or the save fails (IOError), nothing is added.
+        """
+        original_count = len(self.contacts)
+        try:
+            yield self.contacts.extend
+            if not save_contacts(self.contacts, self.filename):
+                raise IOError(f"Could not write {self.filename}")
+        except BaseException:
+            del self.contacts[original_count:]
+            raise
+        self._reindex(added=self.contacts[original_count:])
+
+    def update(self, contact):
+        if not save_contacts(self.contacts, self.filename):
+            return False
+        self._reindex(updated=[contact])
+        return True
+
+    def delete(self, contact):
+        position = self.contacts.index(contact)
+        self.contacts.pop(position)
+        if not save_contacts(self.contacts, self.filename):
+            self.contacts.insert(position, contact)  # Restore contact
+            return False
+        self._reindex(removed=[contact])
+        return True
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage(Storage):
+    """Contacts in an SQLite database, one row per contact.
+
+    Adds, updates and deletes touch only the affected row, and views read
+    only the rows they show. When the SQLite build has FTS5 with the
+    trigram tokenizer, an index over name, phone and email is kept in
+    sync by triggers and used by search().
+    """
+
+    def __init__(self, filename=DB_FILE):
+        self.filename = filename
+        self.connection = sqlite3.connect(filename)
+        self.connection.row_factory = sqlite3.Row
+        # Case-insensitive matching that agrees with Python's str.lower
+        self.connection.create_function('unicode_lower', 1, str.lower, deterministic=True)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        # Seeding decisions depend on whether the table is new, not on
+        # whether it happens to be empty
+        self.created = self.connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contacts'"
+        ).fetchone() is None
+        if not self.created:
+            self._migrate_timestamps()
+        self.connection.execute(CONTACTS_TABLE)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS contacts_name ON contacts (name COLLATE NOCASE)")
+        self.has_fts = self._create_fts()
+        self.connection.commit()
+
+    def _migrate_timestamps(self):
+        """Convert the text timestamps of earlier versions to epoch seconds"""
+        columns = {row['name']: row['type']
+                   for row in self.connection.execute("PRAGMA table_info(contacts)")}
+        if columns['created_at'] == 'INTEGER':
+            return
+        self.connection.create_function('parse_timestamp', 1, parse_timestamp, deterministic=True)
+        # A TEXT column would store the numbers as text, so the table is
+        # rebuilt; ids are kept, so the full-text index stays valid.
+        self.connection.executescript(f"""
+            BEGIN;
+            ALTER TABLE contacts RENAME TO contacts_text;
+            {CONTACTS_TABLE};
+            INSERT INTO contacts (id, name, phone, email, address, created_at, updated_at)
+                SELECT id, name, phone, email, address,
+                       COALESCE(parse_timestamp(created_at), CAST(strftime('%s', 'now') AS INTEGER)),
+                       COALESCE(parse_timestamp(updated_at), parse_timestamp(created_at),
+                                CAST(strftime('%s', 'now') AS INTEGER))
+                FROM contacts_text;
+            DROP TABLE contacts_text;
+            COMMIT;
+        """)
+
+    def _create_fts(self):
+        """Create the trigram full-text index search() narrows rows with"""
+        existing = self.connection.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'contacts_fts'").fetchone()
+        try:
+            if existing and 'trigram' not in existing[0]:
+                # Word index from an earlier version; substrings need trigrams
+                self.connection.executescript("""
+                    DROP TRIGGER IF EXISTS contacts_ai;
+                    DROP TRIGGER IF EXISTS contacts_ad;
+                    DROP TRIGGER IF EXISTS contacts_au;
+                    DROP TABLE contacts_fts;
+                """)
+                existing = None
+            self.connection.executescript("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+                    name, phone, email, content='contacts', content_rowid='id', tokenize='trigram'
+                );
+                CREATE TRIGGER IF NOT EXISTS contacts_ai AFTER INSERT ON contacts BEGIN
+                    INSERT INTO contacts_fts (rowid, name, phone, email)
+                    VALUES (new.id, new.name, new.phone, new.email);
+                END;
+                CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+                    INSERT INTO contacts_fts (contacts_fts, rowid, name, phone, email)
+                    VALUES ('delete', old.id, old.name, old.phone, old.email);
+                END;
+                CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE ON contacts BEGIN
+                    INSERT INTO contacts_fts (contacts_fts, rowid, name, phone, email)
+                    VALUES ('delete', old.id, old.name, old.phone, old.email);
+                    INSERT INTO contacts_fts (rowid, name, phone, email)
+                    VALUES (new.id, new.name, new.phone, new.email);
+                END;
+            """)
+        except sqlite3.OperationalError:
+            # SQLite without FTS5 or its trigram tokenizer (3.34+); search() scans
+            return False
+        if existing is None:
+            # An external-content index starts out empty even when the table is not
+            self.connection.execute("INSERT INTO contacts_fts (contacts_fts) VALUES ('rebuild')")
+        return True
+
+    def index_key(self, contact):
+        # Every load returns fresh objects, so the row id is the identity
+        return contact.id
+
+    def _index_source(self):
+        # Iterated by the indexing thread, which needs its own connection
+        connection = sqlite3.connect(self.filename)
+        connection.row_factory = sqlite3.Row
+        try:
+            for row in connection.execute("SELECT * FROM contacts"):
+                yield self._to_contact(row)
+        finally:
+            connection.close()
+
+    def _to_contact(self, row):
+        contact = Contact.from_dict(dict(row))
+        contact.id = row['id']
+        return contact
+
+    def _write(self, statement, parameters):
+        """Run one write statement in its own transaction"""
+        try:
+            with self.connection:
+                return self.connection.execute(statement, parameters)
+        except sqlite3.Error as e:
+            print(f"❌ Error: Could not save contacts. Error: {e}")
+            return None
+
+    def load(self, limit=None, offset=0):
+        """Return contacts sorted by name, optionally one page at a time"""
+        query = "SELECT * FROM contacts ORDER BY name COLLATE NOCASE"
+        if limit is not None:
+            query += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+        return [self._to_contact(row) for row in self.connection.execute(query)]
+
+    def count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def iter_contacts(self):
+        """Yield every contact sorted by name, one row at a time"""
+        for row in self.connection.execute("SELECT * FROM contacts ORDER BY name COLLATE NOCASE"):
+            yield self._to_contact(row)
+
+    def search(self, field, query):
+        """Contacts whose field contains query (case-insensitive).
+
+        Same matches, in the same order, as JSONStorage.search. A query of
+        three or more characters is looked up in the trigram index as a
+        quoted phrase, which is a substring match; shorter ones, and builds
+        without the index, scan the table with instr, which has no
+        wildcards that would need escaping.
+        """
+        if field not in SEARCH_FIELDS:
+            raise ValueError(f"Cannot search by {field}")
+        query = query.lower()
+        if self.has_fts and len(query) >= 3:
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = self.connection.execute(
+                "SELECT contacts.* FROM contacts_fts JOIN contacts ON contacts.id = contacts_fts.rowid "
+                "WHERE contacts_fts MATCH ? ORDER BY contacts.id", (f"{field} : {phrase}",))
+        else:
+            rows = self.connection.execute(
+                f"SELECT * FROM contacts WHERE instr(unicode_lower({field}), ?) ORDER BY id",
+                (query,))
+        # The index folds case its own way; settle edge cases like str.lower
+        return [self._to_contact(row) for row in rows if query in row[field].lower()]
+
+    def name_exists(self, name):
+        return self.connection.execute(
+            "SELECT 1 FROM contacts WHERE name = ? COLLATE NOCASE LIMIT 1", (name,)
+        ).fetchone() is not None
+
+    def statistics(self, recent=3):
+        total, with_email, with_address = self.connection.execute(
+            "SELECT COUNT(*), COUNT(NULLIF(email, '')), COUNT(NULLIF(address, '')) FROM contacts"
+        ).fetchone()
+        rows = self.connection.execute(
+            "SELECT * FROM contacts ORDER BY updated_at DESC LIMIT ?", (recent,))
+        return {
+            'total': total,
+            'with_email': with_email,
+            'with_address': with_address,
+            'recent': [self._to_contact(row) for row in rows],
+        }
+
+    def add(self, contact):
+        cursor = self._write(
+            "INSERT INTO contacts (name, phone, email, address, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            contact.to_row())
+        if cursor is None:
+            return False
+        contact.id = cursor.lastrowid
+        self._reindex(added=[contact])
+        return True
+
+    def add_many(self, new_contacts):
+        """Insert several contacts in a single transaction"""
+        try:
+            with self.connection:
+                for contact in new_contacts:
+                    contact.id = self.connection.execute(
+                        "INSERT INTO contacts (name, phone, email, address, created_at, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        contact.to_row()).lastrowid
+        except sqlite3.Error as e:
+            for contact in new_contacts:
+                contact.id = None
+            print(f"❌ Error: Could not save contacts. Error: {e}")
+            return False
+        self._reindex(added=new_contacts)
+        return True
+
+    def keys(self):
+        """Yield the (name, phone) pair of every contact, streamed from the table"""
+        return iter(self.connection.execute("SELECT name, phone FROM contacts"))
+
+    @contextlib.contextmanager
+    def bulk_add(self):
+        """Add contacts batch by batch in one transaction.
+
+        Yields a function that takes a list of contacts; each batch is
+        written as it arrives and all of them are committed when the block
+        ends. If the block raises, or a write fails (IOError), nothing is
+        added. Added contacts are only kept for the fuzzy index, if any.
+        """
+        added = [] if self._indexer is not None else None
+
+        def add_batch(batch):
+            for contact in batch:
+                contact.id = self.connection.execute(
+                    "INSERT INTO contacts (name, phone, email, address, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    contact.to_row()).lastrowid
+            if added is not None:
+                added.extend(batch)
+
+        try:
+            with self.connection:
+                yield add_batch
+        except sqlite3.Error as e:
+            raise IOError(f"Could not save contacts. Error: {e}") from e
+        if added:
+            self._reindex(added=added)
+
+    def update(self, contact):
+        if self._write(
+                "UPDATE contacts SET name = ?, phone = ?, email = ?, address = ?, "
+                "created_at = ?, updated_at = ? WHERE id = ?",
+                contact.to_row() + (contact.id,)) is None:
+            return False
+        self._reindex(updated=[contact])
+        return True
+
+    def delete(self, contact):
+        if self._write("DELETE FROM contacts WHERE id = ?", [contact.id]) is None:
+            return False
+        self._reindex(removed=[contact])
+        return True
+
+    def import_json(self, filename=JSON_FILE):
+        """Copy contacts from a JSON file in the original format"""
+        contacts = load_contacts(filename)
+        if contacts and not self.add_many(contacts):
+            return 0
+        return len(contacts)
+
+    def close(self):
+        self.connection.close()
+
+
+def open_storage(backend=None):
+    """Open the storage backend named by CONTACT_BOOK_STORAGE (json or sqlite).
+
+    A newly created SQLite database is seeded from contacts.json when one
+    exists; an existing database is never re-seeded, even if it is empty.
+    """
+    backend = (backend or os.environ.get('CONTACT_BOOK_STORAGE', 'json')).lower()
+    if backend == 'json':
+        return JSONStorage()
+    if backend == 'sqlite':
+        storage = SQLiteStorage()
+        if storage.created and os.path.exists(JSON_FILE):
+            storage.import_json(JSON_FILE)
+        return storage
+    raise ValueError(f"Unknown storage backend: {backend} (use json or sqlite)")
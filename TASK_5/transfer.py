@@ -0,0 +1,288 @@
+import csv
+import json
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from contact import Contact
+from validation import contact_key, validate_records
+
+FIELDS = ['name', 'phone', 'email', 'address', 'created_at', 'updated_at']
+BATCH_SIZE = 10000
+
+# Header spellings commonly produced by other address books
+CSV_ALIASES = {
+    'full name': 'name',
+    'display name': 'name',
+    'phone number': 'phone',
+    'mobile': 'phone',
+    'tel': 'phone',
+    'telephone': 'phone',
+    'e-mail': 'email',
+    'email address': 'email',
+}
+
+
+def detect_format(path):
+    """Guess the file format from its extension"""
+    lower = path.lower()
+    if lower.endswith('.csv'):
+        return 'csv'
+    if lower.endswith(('.vcf', '.vcard')):
+        return 'vcard'
+    if lower.endswith('.json'):
+        return 'json'
+    raise ValueError(f"Unsupported file type: {path} (use .csv, .vcf or .json)")
+
+
+# ---------- Readers (one record at a time, so memory stays flat) ----------
+
+def read_csv(path):
+    """Yield contact dicts from a CSV file with a header row"""
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = []
+        for title in header:
+            title = title.strip().lower()
+            columns.append(CSV_ALIASES.get(title, title))
+        for values in reader:
+            row = {}
+            for column, value in zip(columns, values):
+                if column in FIELDS:
+                    row[column] = value.strip()
+            yield row
+
+
+VCARD_SEPARATOR = re.compile(r'(?<!\\);')
+
+
+def _split_vcard(value):
+    """Split a structured value on its unescaped semicolons"""
+    return [_unescape_vcard(part).strip() for part in VCARD_SEPARATOR.split(value)]
+
+
+def _unescape_vcard(value):
+    return (value.replace('\\n', '\n').replace('\\N', '\n')
+                 .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def _vcard_lines(f):
+    """Yield logical vCard lines, joining folded continuation lines"""
+    current = None
+    for line in f:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def read_vcard(path):
+    """Yield contact dicts from a vCard (.vcf) file"""
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        card = None
+        for line in _vcard_lines(f):
+            if ':' not in line:
+                continue
+            key, value = line.split(':', 1)
+            prop = key.split(';', 1)[0].split('.')[-1].upper()
+
+            if prop == 'BEGIN':
+                card = {}
+            elif card is None:
+                continue
+            elif prop == 'END':
+                yield card
+                card = None
+            elif prop == 'FN':
+                card['name'] = _unescape_vcard(value).strip()
+            elif prop == 'N' and 'name' not in card:
+                # N is "Family;Given;Additional;Prefix;Suffix"
+                parts = _split_vcard(value)
+                ordered = parts[3:4] + parts[1:3] + parts[0:1] + parts[4:5]
+                card['name'] = ' '.join(p for p in ordered if p)
+            elif prop == 'TEL' and 'phone' not in card:
+                card['phone'] = _unescape_vcard(value).strip()
+            elif prop == 'EMAIL' and 'email' not in card:
+                card['email'] = _unescape_vcard(value).strip()
+            elif prop == 'ADR' and 'address' not in card:
+                parts = _split_vcard(value)
+                card['address'] = ', '.join(p for p in parts if p)
+
+
+def read_json(path, chunk_size=65536):
+    """Yield contact dicts from a file in the contacts.json format.
+
+    The file is one JSON list; its objects are decoded one at a time from
+    a sliding buffer instead of loading the whole list.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{path} is not a JSON list of contacts")
+        position = 1
+        while True:
+            # Skip the whitespace and comma between objects
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if buffer[position:position + 1] == ']':
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # Most likely an object cut off at the end of the buffer
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            if not isinstance(item, dict):
+                raise ValueError(f"{path} is not a JSON list of contacts")
+            yield {field: value for field, value in item.items()
+                   if field in FIELDS and isinstance(value, str)}
+
+
+READERS = {'csv': read_csv, 'vcard': read_vcard, 'json': read_json}
+
+
+# ---------- Writers ----------
+
+def write_csv(contacts, path):
+    """Write contacts to a CSV file, one row at a time; returns the count"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for contact in contacts:
+            data = contact.to_dict()
+            writer.writerow([data[field] for field in FIELDS])
+            count += 1
+    return count
+
+
+def _escape_vcard(value):
+    return (value.replace('\\', '\\\\').replace('\n', '\\n')
+                 .replace(',', '\\,').replace(';', '\\;'))
+
+
+def write_vcard(contacts, path):
+    """Write contacts to a vCard 3.0 file; returns the count"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        for contact in contacts:
+            lines = [
+                'BEGIN:VCARD',
+                'VERSION:3.0',
+                f"FN:{_escape_vcard(contact.name)}",
+                f"N:;{_escape_vcard(contact.name)};;;",
+                f"TEL:{_escape_vcard(contact.phone)}",
+            ]
+            if contact.email:
+                lines.append(f"EMAIL:{_escape_vcard(contact.email)}")
+            if contact.address:
+                lines.append(f"ADR:;;{_escape_vcard(contact.address)};;;;")
+            lines.append('END:VCARD')
+            f.write('\r\n'.join(lines) + '\r\n')
+            count += 1
+    return count
+
+
+def write_json(contacts, path):
+    """Write contacts in the contacts.json format, one object at a time; returns the count"""
+    count = 0
+    with open(path, 'w') as f:
+        for contact in contacts:
+            # Same layout as json.dump(list, indent=4) in save_contacts
+            item = json.dumps(contact.to_dict(), indent=4).replace('\n', '\n    ')
+            f.write(('[\n    ' if count == 0 else ',\n    ') + item)
+            count += 1
+        f.write('\n]' if count else '[]')
+    return count
+
+
+WRITERS = {'csv': write_csv, 'vcard': write_vcard, 'json': write_json}
+
+
+def export_contacts(contacts, path, fmt=None):
+    """Export contacts (any iterable) to CSV, vCard or JSON, chosen by fmt or the file extension"""
+    return WRITERS[fmt or detect_format(path)](contacts, path)
+
+
+# ---------- Import ----------
+
+def validate_batch(rows, country_code=''):
+    """Validate a batch of rows; returns (valid rows, index keys, invalid count)"""
+    return validate_records(rows, country_code)
+
+
+def _batches(rows, batch_size):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _validated_batches(batches, workers, country_code=''):
+    """Validate batches in order, optionally across a process pool.
+
+    At most two batches per worker are in flight, so a slow consumer never
+    causes the whole input file to be read into memory.
+    """
+    if not workers:
+        for batch in batches:
+            yield validate_batch(batch, country_code)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(validate_batch, batch, country_code))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def import_contacts(existing, path, add_batch, fmt=None, workers=0, batch_size=BATCH_SIZE,
+                    country_code=''):
+    """Stream contacts from a CSV, vCard or contacts.json file into the book.
+
+    existing yields the (name, phone) pairs already in the book. Rows are
+    validated in batches and checked against a hash index of those keys
+    (and of earlier rows in the file) so duplicates are skipped. Each
+    batch of new contacts is handed to add_batch, so only one batch is
+    held at a time; committing them is up to the caller. country_code is
+    applied to numbers without one when comparing phones.
+    Returns a dict with 'added', 'duplicates' and 'invalid' counts.
+    """
+    reader = READERS[fmt or detect_format(path)]
+    seen = {contact_key(name, phone, country_code) for name, phone in existing}
+    stats = {'added': 0, 'duplicates': 0, 'invalid': 0}
+
+    batches = _batches(reader(path), batch_size)
+    for valid, keys, invalid in _validated_batches(batches, workers, country_code):
+        stats['invalid'] += invalid
+        new_contacts = []
+        for row, key in zip(valid, keys):
+            if key in seen:
+                stats['duplicates'] += 1
+                continue
+            seen.add(key)
+            new_contacts.append(Contact.from_dict(row))
+        if new_contacts:
+            add_batch(new_contacts)
+            stats['added'] += len(new_contacts)
+
+    return stats
@@ -0,0 +1,171 @@
+import re
+
+MIN_PHONE_DIGITS = 10
+MAX_PHONE_DIGITS = 15  # E.164 limit, country code included
+
+# Separators people type inside phone numbers. Deleting them with
+# bytes.translate is several times faster than str.translate or filtering
+# character by character.
+PHONE_SEPARATORS = b' -.()/+'
+NON_DIGITS = re.compile(r'\D+')
+# Practical RFC 5322 subset: dot-atom local part, dotted domain, alpha TLD.
+# Dot and hyphen placement is checked by valid_email_syntax with plain
+# string operations; spelling it out in the regex makes it backtrack and
+# roughly halves its speed.
+EMAIL_PATTERN = re.compile(
+    r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-][A-Za-z0-9!#$%&'*+/=?^_`{|}~.-]*"
+    r"@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,63}"
+)
+
+
+def phone_digits(phone):
+    """Return only the digits of a phone number"""
+    if phone.isascii():
+        stripped = phone.encode('ascii').translate(None, PHONE_SEPARATORS)
+        if stripped.isdigit():
+            return stripped.decode('ascii')
+    # Fall back to the regex for letters, extensions and other symbols
+    return NON_DIGITS.sub('', phone)
+
+
+def validate_phone(phone):
+    """Basic phone number validation"""
+    return len(phone_digits(phone)) >= MIN_PHONE_DIGITS
+
+
+def valid_email_syntax(email):
+    """True if email matches EMAIL_PATTERN with no empty dot-atoms in the
+    local part and no domain label starting or ending with a hyphen"""
+    if EMAIL_PATTERN.fullmatch(email) is None:
+        return False
+    local, _, domain = email.partition('@')
+    return not ('..' in local or local[-1] == '.'
+                or domain[0] == '-' or '-.' in domain or '.-' in domain)
+
+
+def validate_email(email):
+    """Email syntax validation"""
+    if not email:  # Email is optional
+        return True
+    return valid_email_syntax(email)
+
+
+def normalize_phone(phone, country_code=''):
+    """Return an E.164-style "+<digits>" phone number, or None if invalid.
+
+    Numbers written with a leading "+" or "00" are treated as international
+    (the "00" is dropped only when enough digits remain). Other numbers get
+    country_code prepended when it is given.
+    """
+    return _normalize_digits(phone, phone_digits(phone), country_code)
+
+
+def _normalize_digits(phone, digits, country_code):
+    """normalize_phone for a phone whose digits are already extracted"""
+    if digits.startswith('00') and phone.lstrip().startswith('00') \
+            and len(digits) - 2 >= MIN_PHONE_DIGITS:
+        digits = digits[2:]
+    elif country_code and not phone.lstrip().startswith('+'):
+        digits = country_code + digits
+    if MIN_PHONE_DIGITS <= len(digits) <= MAX_PHONE_DIGITS:
+        return '+' + digits
+    return None
+
+
+def normalize_email(email):
+    """Return the lowercased email, '' if empty, or None if invalid"""
+    email = email.strip()
+    if not email:
+        return ''
+    if not valid_email_syntax(email):
+        return None
+    return email.lower()
+
+
+def phone_key(phone, country_code=''):
+    """Index key for any phone validate_phone accepts.
+
+    Uses the E.164 form when there is one, otherwise the bare digits (for
+    example numbers with a long extension).
+    """
+    return normalize_phone(phone, country_code) or phone_digits(phone)
+
+
+def contact_key(name, phone, country_code=''):
+    """Index key for a contact: case-insensitive name plus normalized phone"""
+    return name.strip().lower(), phone_key(phone, country_code)
+
+
+# ---------- Batch API ----------
+
+def phone_digits_column(phones):
+    """phone_digits for a whole column at once.
+
+    The column is joined and stripped of separators with a single
+    bytes.translate call; only entries with other symbols fall back to
+    the regex one by one.
+    """
+    joined = '\0'.join(phones)
+    if not joined.isascii():
+        return [phone_digits(phone) for phone in phones]
+    stripped = joined.encode('ascii').translate(None, PHONE_SEPARATORS)
+    digits = stripped.decode('ascii').split('\0')
+    if len(digits) != len(phones):  # A phone contained the NUL separator
+        return [phone_digits(phone) for phone in phones]
+    if not stripped.replace(b'\0', b'').isdigit():
+        digits = [d if d.isdigit() else NON_DIGITS.sub('', phone)
+                  for d, phone in zip(digits, phones)]
+    return digits
+
+
+def _normalize_column(phones, digits, country_code):
+    if country_code:
+        return [_normalize_digits(phone, d, country_code) for phone, d in zip(phones, digits)]
+    # Without a country code most numbers are already "+<digits>" material
+    return ['+' + d if MIN_PHONE_DIGITS <= len(d) <= MAX_PHONE_DIGITS and d[:2] != '00'
+            else _normalize_digits(phone, d, '')
+            for phone, d in zip(phones, digits)]
+
+
+def normalize_phones(phones, country_code=''):
+    """Normalize a column of phone numbers; invalid entries become None"""
+    return _normalize_column(phones, phone_digits_column(phones), country_code)
+
+
+def normalize_emails(emails):
+    """Normalize a column of emails; invalid entries become None"""
+    normalized = []
+    for email in emails:
+        email = email.strip()
+        if not email:
+            normalized.append('')
+        elif not valid_email_syntax(email):
+            normalized.append(None)
+        else:
+            normalized.append(email.lower())
+    return normalized
+
+
+def validate_records(rows, country_code=''):
+    """Validate a batch of contact dicts column by column.
+
+    Rows are accepted by the same rules as the interactive prompts
+    (validate_phone, validate_email), so anything the app saved can be
+    imported again. Returns (valid rows, their index keys, invalid count).
+    Rows keep the phone and email exactly as written; the keys use the
+    normalized forms and match contact_key with the same country_code.
+    """
+    names = [row.get('name', '').strip() for row in rows]
+    phones = [row.get('phone', '') for row in rows]
+    digits = phone_digits_column(phones)
+    normalized = _normalize_column(phones, digits, country_code)
+    emails = normalize_emails([row.get('email', '') for row in rows])
+
+    valid = []
+    keys = []
+    for row, name, number, e164, email in zip(rows, names, digits, normalized, emails):
+        # Same checks as validate_phone and phone_key, on digits extracted once
+        if name and len(number) >= MIN_PHONE_DIGITS and email is not None:
+            valid.append(row)
+            keys.append((name.lower(), e164 or number))
+    return valid, keys, len(rows) - len(valid)
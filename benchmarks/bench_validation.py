@@ -0,0 +1,96 @@
+"""Benchmark contact validation, the bottleneck of bulk imports.
+
+Compares the original per-call validators with the batch API in
+TASK_5/validation.py over synthetic phone/email columns, and times
+validate_records, the per-batch step of every import.
+
+    python benchmarks/bench_validation.py --rows 10000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'TASK_5'))
+
+from validation import (normalize_emails, normalize_phones, validate_email, validate_phone,
+                        validate_records)
+
+PHONE_FORMATS = ['{}{}{}-{}{}{}-{}{}{}{}', '({}{}{}) {}{}{} {}{}{}{}', '+1 {}{}{}.{}{}{}.{}{}{}{}', '{}{}{}{}{}{}{}{}{}{}']
+EMAIL_FORMATS = ['{}@example.com', '{}.work@mail.co.uk', '', 'not-an-email-{}']
+
+
+def legacy_validate_phone(phone):
+    clean_phone = ''.join(filter(str.isdigit, phone))
+    return len(clean_phone) >= 10
+
+
+def legacy_validate_email(email):
+    if not email:
+        return True
+    return '@' in email and '.' in email
+
+
+def make_columns(rows, seed=0):
+    """Generate synthetic (phones, emails) columns"""
+    rng = random.Random(seed)
+    digits = '0123456789'
+    phones = [rng.choice(PHONE_FORMATS).format(*rng.choices(digits, k=10)) for _ in range(rows)]
+    emails = [rng.choice(EMAIL_FORMATS).format(f"user{i}") for i in range(rows)]
+    return phones, emails
+
+
+def make_records(phones, emails):
+    """Rows as the CSV and vCard readers produce them"""
+    return [{'name': f"User {i}", 'phone': phone, 'email': email}
+            for i, (phone, email) in enumerate(zip(phones, emails))]
+
+
+def legacy_records(rows):
+    """The app's original checks applied row by row, keyed like the old duplicate check"""
+    valid = [row for row in rows
+             if row['name'] and legacy_validate_phone(row['phone']) and legacy_validate_email(row['email'])]
+    return valid, [(row['name'].lower(), row['phone']) for row in valid]
+
+
+CASES = [
+    ('phone  legacy', lambda phones, emails, rows: [legacy_validate_phone(p) for p in phones]),
+    ('phone  validate_phone', lambda phones, emails, rows: [validate_phone(p) for p in phones]),
+    ('phone  normalize_phones', lambda phones, emails, rows: normalize_phones(phones)),
+    ('email  legacy', lambda phones, emails, rows: [legacy_validate_email(e) for e in emails]),
+    ('email  validate_email', lambda phones, emails, rows: [validate_email(e) for e in emails]),
+    ('email  normalize_emails', lambda phones, emails, rows: normalize_emails(emails)),
+    ('record legacy', lambda phones, emails, rows: legacy_records(rows)),
+    ('record validate_records', lambda phones, emails, rows: validate_records(rows)),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--chunk', type=int, default=1_000_000,
+                        help="rows generated and validated at a time")
+    args = parser.parse_args()
+
+    totals = {}
+    remaining = args.rows
+    seed = 0
+    while remaining > 0:
+        size = min(args.chunk, remaining)
+        phones, emails = make_columns(size, seed)
+        rows = make_records(phones, emails)
+        for label, func in CASES:
+            start = time.perf_counter()
+            func(phones, emails, rows)
+            totals[label] = totals.get(label, 0.0) + time.perf_counter() - start
+        remaining -= size
+        seed += 1
+
+    print(f"{args.rows:,} rows")
+    for label, elapsed in totals.items():
+        print(f"{label:<24} {elapsed:8.2f} s  {args.rows / elapsed:14,.0f} rows/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Synthetic data generators for the benchmark suite.
+
+Every generator takes a size and a seed so runs are reproducible.
+"""
+import random
+import string
+
+FIRST_NAMES = ['John', 'Jane', 'Rajesh', 'Priya', 'Ahmed', 'Maria', 'Wei', 'Olga', 'Kwame', 'Sofia']
+LAST_NAMES = ['Smith', 'Kumar', 'Garcia', 'Chen', 'Ivanova', 'Mensah', 'Rossi', 'Khan', 'Lee', 'Brown']
+STREETS = ['Main St', 'Park Ave', 'MG Road', 'High St', 'Station Rd', 'Lake View']
+OPERATIONS = ['+', '-', '*', '/']
+CHOICES = ['rock', 'paper', 'scissors']
+
+
+def _word(rng, low=3, high=9):
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(low, high)))
+
+
+def task_descriptions(size, seed=0):
+    """Return to-do descriptions such as "Buy milk 42" """
+    rng = random.Random(seed)
+    return [f"{_word(rng).capitalize()} {_word(rng)} {i}" for i in range(size)]
+
+
+def calculations(size, seed=0):
+    """Return (num1, num2, operation) tuples; divisors are never zero"""
+    rng = random.Random(seed)
+    return [(rng.uniform(-1000, 1000), rng.uniform(1, 1000), rng.choice(OPERATIONS))
+            for _ in range(size)]
+
+
+def rps_rounds(size, seed=0):
+    """Return (user choice, computer choice) pairs"""
+    rng = random.Random(seed)
+    return [(rng.choice(CHOICES), rng.choice(CHOICES)) for _ in range(size)]
+
+
+def contact_dicts(size, seed=0):
+    """Return contacts in the contacts.json format"""
+    rng = random.Random(seed)
+    contacts = []
+    for i in range(size):
+        first = rng.choice(FIRST_NAMES) if rng.random() < 0.5 else _word(rng).capitalize()
+        last = rng.choice(LAST_NAMES) if rng.random() < 0.5 else _word(rng, 4, 10).capitalize()
+        stamp = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00:00"
+        contacts.append({
+            'name': f"{first} {last}",
+            'phone': f"+91 {rng.randint(60000, 99999)} {rng.randint(10000, 99999)}",
+            'email': f"{first.lower()}.{last.lower()}{i}@example.com" if rng.random() < 0.8 else '',
+            'address': f"{rng.randint(1, 999)} {rng.choice(STREETS)}" if rng.random() < 0.6 else '',
+            'created_at': stamp,
+            'updated_at': stamp,
+        })
+    return contacts
@@ -0,0 +1,418 @@
+"""Headless benchmark runner for the five CODSOFT apps.
+
+Drives the hot paths directly (no input() prompts, no screen clearing)
+over synthetic data of several sizes and reports throughput, per-call
+latency percentiles and peak traced memory.
+
+    python benchmarks/run.py
+    python benchmarks/run.py --sizes 1000,100000 --only contacts --json results.json
+    python benchmarks/run.py --compare results.json
+    python benchmarks/run.py --compare results.json --json -
+    python benchmarks/run.py --only todo --profile cprofile
+
+"ops" counts what one call processes: records for load/save/index cases,
+items for the per-item cases (calculations, passwords, rounds) and one
+for single actions such as add_task or a search query.
+"""
+import argparse
+import builtins
+import contextlib
+import cProfile
+import importlib.util
+import io
+import json
+import math
+import os
+import platform
+import pstats
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import data
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = '100,1000,10000'
+CASES = {}
+
+
+def load_module(name, relative_path):
+    """Import an app by file path; several of them are called main.py"""
+    path = os.path.join(ROOT, relative_path)
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # So sibling imports share this copy
+    spec.loader.exec_module(module)
+    return module
+
+
+todo_app = load_module('todo_app', 'TASK_1/todo_list_app/main.py')
+calculator = load_module('calculator', 'TASK_2/calculator.py')
+password_generator = load_module('password_generator', 'TASK_3/password_generator.py')
+rock_paper_scissors = load_module('rock_paper_scissors', 'TASK_4/rock_paper_scissors.py')
+contact = load_module('contact', 'TASK_5/contact.py')
+search = load_module('search', 'TASK_5/search.py')
+storage = load_module('storage', 'TASK_5/storage.py')
+validation = load_module('validation', 'TASK_5/validation.py')
+
+
+def case(name):
+    """Register a benchmark.
+
+    The decorated function receives (size, workdir) and returns
+    (op, ops): a zero-argument callable to time and how many operations
+    one call performs. Cases that open files or connections return
+    (op, ops, cleanup) instead; cleanup runs before workdir is removed.
+    """
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@contextlib.contextmanager
+def headless():
+    """Fail loudly on input() and silence the apps' print() output"""
+    def no_input(prompt=''):
+        raise RuntimeError(f"benchmark reached an interactive prompt: {prompt!r}")
+
+    original_input = builtins.input
+    builtins.input = no_input
+    try:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        builtins.input = original_input
+
+
+# ---------- TASK_1: to-do list ----------
+
+def _todo_list(size, workdir):
+    filename = os.path.join(workdir, 'tasks.json')
+    tasks = [todo_app.Task(description, id=str(i))
+             for i, description in enumerate(data.task_descriptions(size))]
+    with open(filename, 'w') as f:
+        json.dump([task.to_dict() for task in tasks], f, indent=4)
+    return todo_app.TodoList(filename)
+
+
+@case('todo.add_task')
+def bench_todo_add(size, workdir):
+    todo = _todo_list(size, workdir)
+    return lambda: todo.add_task("Benchmark task"), 1
+
+
+@case('todo.save_tasks')
+def bench_todo_save(size, workdir):
+    todo = _todo_list(size, workdir)
+    return todo.save_tasks, size
+
+
+@case('todo.load_tasks')
+def bench_todo_load(size, workdir):
+    todo = _todo_list(size, workdir)
+    return todo.load_tasks, size
+
+
+# ---------- TASK_2 to TASK_4 ----------
+
+@case('calculator.calculate')
+def bench_calculate(size, workdir):
+    rows = data.calculations(size)
+    calculate = calculator.calculate
+
+    def op():
+        for num1, num2, operation in rows:
+            calculate(num1, num2, operation)
+    return op, size
+
+
+@case('password.generate_password')
+def bench_generate_password(size, workdir):
+    generate_password = password_generator.generate_password
+
+    def op():
+        for _ in range(size):
+            generate_password(16)
+    return op, size
+
+
+@case('rps.determine_winner')
+def bench_determine_winner(size, workdir):
+    rounds = data.rps_rounds(size)
+    determine_winner = rock_paper_scissors.determine_winner
+
+    def op():
+        for user_choice, computer_choice in rounds:
+            determine_winner(user_choice, computer_choice)
+    return op, size
+
+
+# ---------- TASK_5: contact book ----------
+
+def _contacts(size):
+    return [contact.Contact.from_dict(item) for item in data.contact_dicts(size)]
+
+
+def _json_storage(size, workdir):
+    filename = os.path.join(workdir, 'contacts.json')
+    storage.save_contacts(_contacts(size), filename)
+    return storage.JSONStorage(filename)
+
+
+@case('contacts.load_json')
+def bench_contacts_load(size, workdir):
+    filename = os.path.join(workdir, 'contacts.json')
+    with open(filename, 'w') as f:
+        json.dump(data.contact_dicts(size), f, indent=4)
+    return lambda: storage.load_contacts(filename), size
+
+
+@case('contacts.save_json')
+def bench_contacts_save(size, workdir):
+    contacts = _contacts(size)
+    filename = os.path.join(workdir, 'contacts.json')
+    return lambda: storage.save_contacts(contacts, filename), size
+
+
+@case('contacts.load_sqlite')
+def bench_contacts_load_sqlite(size, workdir):
+    database = storage.SQLiteStorage(os.path.join(workdir, 'contacts.db'))
+    database.add_many(_contacts(size))
+    return database.load, size, database.close
+
+
+@case('contacts.add_json')
+def bench_contacts_add_json(size, workdir):
+    # Every change rewrites the whole file
+    book = _json_storage(size, workdir)
+    return lambda: book.add(contact.Contact("Benchmark Contact", "555-010-0000")), 1
+
+
+@case('contacts.update_json')
+def bench_contacts_update_json(size, workdir):
+    book = _json_storage(size, workdir)
+    target = book.contacts[len(book.contacts) // 2]
+
+    def op():
+        target.touch()
+        book.update(target)
+    return op, 1
+
+
+@case('contacts.update_sqlite')
+def bench_contacts_update_sqlite(size, workdir):
+    database = storage.SQLiteStorage(os.path.join(workdir, 'contacts.db'))
+    contacts = _contacts(size)
+    database.add_many(contacts)
+    target = contacts[len(contacts) // 2]
+
+    def op():
+        target.touch()
+        database.update(target)
+    return op, 1, database.close
+
+
+@case('contacts.search_json')
+def bench_contacts_search_json(size, workdir):
+    # The "Name" option of search_contact on the JSON backend
+    book = _json_storage(size, workdir)
+    return lambda: book.search('name', 'smi'), 1
+
+
+@case('contacts.search_sqlite')
+def bench_contacts_search_sqlite(size, workdir):
+    # Three or more characters go through the trigram full-text index
+    database = storage.SQLiteStorage(os.path.join(workdir, 'contacts.db'))
+    database.add_many(_contacts(size))
+    return lambda: database.search('name', 'smi'), 1, database.close
+
+
+@case('contacts.fuzzy_index')
+def bench_contacts_fuzzy_index(size, workdir):
+    contacts = _contacts(size)
+    return lambda: search.ContactIndex(contacts), size
+
+
+@case('contacts.fuzzy_search')
+def bench_contacts_fuzzy_search(size, workdir):
+    index = search.ContactIndex(_contacts(size))
+    return lambda: index.search("Jon Smtih"), 1
+
+
+@case('contacts.fuzzy_search_common')
+def bench_contacts_fuzzy_search_common(size, workdir):
+    # Words most contacts share (street suffixes, email domains) and a prefix
+    index = search.ContactIndex(_contacts(size))
+    queries = ["main st", "example", "john", "smi"]
+
+    def op():
+        for query in queries:
+            index.search(query)
+    return op, len(queries)
+
+
+@case('contacts.normalize_phones')
+def bench_normalize_phones(size, workdir):
+    phones = [item['phone'] for item in data.contact_dicts(size)]
+    return lambda: validation.normalize_phones(phones), size
+
+
+# ---------- Runner ----------
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of an unsorted list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def profile_call(name, size, op, mode):
+    """Run op once under cProfile or tracemalloc and print the top entries"""
+    print(f"\n--- {mode}: {name} (size {size}) ---", file=sys.stderr)
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        with headless():
+            profiler.runcall(op)
+        report = io.StringIO()
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(15)
+        print(report.getvalue(), file=sys.stderr)
+    else:
+        tracemalloc.start(25)
+        with headless():
+            op()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        for stat in snapshot.statistics('lineno')[:10]:
+            print(stat, file=sys.stderr)
+
+
+def run_case(name, size, rounds, profile=None):
+    """Time one case at one size and return its result record"""
+    with tempfile.TemporaryDirectory() as workdir:
+        with headless():
+            op, ops, *cleanup = CASES[name](size, workdir)
+        try:
+            with headless():
+                op()  # Warm-up: imports, caches, file system
+
+                timings = []
+                for _ in range(rounds):
+                    start = time.perf_counter()
+                    op()
+                    timings.append(time.perf_counter() - start)
+
+                # Peak memory comes from a separate call; tracing slows timing
+                tracemalloc.start()
+                op()
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+            if profile:
+                profile_call(name, size, op, profile)
+        finally:
+            # Close connections first; Windows cannot delete open files
+            for close in cleanup:
+                close()
+
+    total = sum(timings)
+    return {
+        'case': name,
+        'size': size,
+        'rounds': rounds,
+        'ops_per_call': ops,
+        # None rather than infinity, which is not valid JSON
+        'ops_per_sec': ops * rounds / total if total else None,
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'p99_ms': percentile(timings, 0.99) * 1000,
+        'peak_kib': peak / 1024,
+    }
+
+
+def add_baseline_ratios(results, baseline):
+    """Record ops/s relative to the baseline run (None if either rate is missing)"""
+    for result in results:
+        previous = baseline.get((result['case'], result['size']))
+        if previous and result['ops_per_sec'] and previous['ops_per_sec']:
+            result['vs_baseline'] = result['ops_per_sec'] / previous['ops_per_sec']
+        else:
+            result['vs_baseline'] = None
+
+
+def print_table(results, baseline=None):
+    header = f"{'case':<28} {'size':>8} {'ops/s':>14} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'peak KiB':>10}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        rate = result['ops_per_sec']
+        rate = f"{rate:>14,.0f}" if rate is not None else f"{'-':>14}"
+        line = (f"{result['case']:<28} {result['size']:>8} {rate} "
+                f"{result['p50_ms']:>10.3f} {result['p95_ms']:>10.3f} {result['p99_ms']:>10.3f} "
+                f"{result['peak_kib']:>10.0f}")
+        if baseline:
+            ratio = result['vs_baseline']
+            line += f" {ratio:>7.2f}x" if ratio is not None else f" {'-':>8}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f"comma-separated data sizes (default {DEFAULT_SIZES})")
+    parser.add_argument('--rounds', type=int, default=5, help="timed calls per case and size")
+    parser.add_argument('--only', default='',
+                        help="comma-separated case name prefixes, e.g. todo,contacts.fuzzy")
+    parser.add_argument('--profile', choices=['cprofile', 'tracemalloc'],
+                        help="also profile one call of each case (report goes to stderr)")
+    parser.add_argument('--json', metavar='PATH', help="write results as JSON ('-' for stdout)")
+    parser.add_argument('--compare', metavar='PATH', help="JSON results from an earlier run to compare against")
+    parser.add_argument('--list', action='store_true', help="list case names and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        print('\n'.join(CASES))
+        return
+
+    prefixes = [p for p in args.only.split(',') if p]
+    names = [name for name in CASES if not prefixes or name.startswith(tuple(prefixes))]
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = []
+    for name in names:
+        for size in sizes:
+            results.append(run_case(name, size, args.rounds, args.profile))
+            if args.json != '-':
+                print(f"{name} size={size} done", file=sys.stderr)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'results': results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {(r['case'], r['size']): r for r in json.load(f)['results']}
+        add_baseline_ratios(results, baseline)
+        report['baseline'] = args.compare
+
+    if args.json == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_table(results, baseline)
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()